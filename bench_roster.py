@@ -0,0 +1,71 @@
+# bench_roster.py
+# مقایسه حافظه مصرفی به ازای هر شرکت‌کننده: ردیف‌های dict (مثل cursor(dictionary=True))
+# در برابر CompactRoster، به همراه زمان جستجو و راه‌اندازی مجدد از فایل.
+# اجرا: python bench_roster.py [تعداد نفرات]
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from roster import CompactRoster
+
+FIRST_NAMES = ["محمد", "علی", "حسین", "رضا", "مهدی", "امیرحسین", "محمدرضا", "ابوالفضل", "سید حسن", "مصطفی"]
+LAST_NAMES = ["رضایی", "احمدی", "محمدی", "حسینی", "کریمی", "موسوی", "جعفری", "صادقی", "قاسمی", "نوروزی زاده"]
+
+def make_rows(n: int):
+    rng = random.Random(42)
+    ids = rng.sample(range(10**9, 10**10), n)
+    for nid in ids:
+        yield (
+            str(nid).zfill(10),
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            rng.choice(FIRST_NAMES),
+            rng.choice(["paid", "unpaid"]),
+        )
+
+def measure(build):
+    """حافظه باقی‌مانده پس از ساخت (بایت) و خود شیء ساخته‌شده"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, obj
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rows = sorted(make_rows(n)) # CompactRoster ردیف‌های مرتب بر اساس کد ملی می‌گیرد (مثل ORDER BY در دیتابیس)
+    keys = ['national_id', 'full_name', 'father_name', 'payment_status']
+    lookup_ids = [r[0] for r in random.Random(7).sample(rows, min(n, 10_000))]
+
+    # ردیف‌ها از نو ساخته می‌شوند تا رشته‌ها مثل خروجی دیتابیس جدید باشند و با rows مشترک نباشند
+    dict_bytes, dict_rows = measure(lambda: {r[0]: dict(zip(keys, r)) for r in make_rows(n)})
+    compact_bytes, compact = measure(lambda: CompactRoster.build(rows))
+
+    start = time.perf_counter()
+    for nid in lookup_ids:
+        compact.get(nid)
+    lookup_us = (time.perf_counter() - start) / len(lookup_ids) * 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roster.bin")
+        CompactRoster.build_file(path, rows).close()
+        start = time.perf_counter()
+        mapped_bytes, mapped = measure(lambda: CompactRoster.open(path))
+        open_ms = (time.perf_counter() - start) * 1e3
+        assert all(mapped.get(nid) == dict_rows[nid] for nid in lookup_ids)
+        file_size = os.path.getsize(path)
+        mapped.close()
+
+    print(f"participants:              {n}")
+    print(f"dict rows:                 {dict_bytes / n:8.1f} bytes/participant")
+    print(f"CompactRoster (in memory): {compact_bytes / n:8.1f} bytes/participant")
+    print(f"CompactRoster (mmap heap): {mapped_bytes / n:8.1f} bytes/participant")
+    print(f"roster file:               {file_size / n:8.1f} bytes/participant")
+    print(f"lookup by national_id:     {lookup_us:8.2f} us")
+    print(f"warm restart (mmap open):  {open_ms:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
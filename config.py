@@ -16,6 +16,34 @@ LOCK_DURATION_SECONDS = 60
 POOL_NAME = "bale_bot_pool"
 POOL_SIZE = 5
 
+# -- لاگ‌های سیستمی --
+LOGS_PAGE_SIZE = 15                   # تعداد رخداد در هر صفحه دستور /logs
+LOGS_VIEWS_KEPT = 100                 # تعداد پیام‌های /logs که دکمه‌های صفحه‌بندی‌شان فعال می‌ماند
+AUDIT_RETENTION_DAYS = 90             # لاگ‌های قدیمی‌تر بایگانی و از دیتابیس حذف می‌شوند
+AUDIT_PARTITIONS_AHEAD_DAYS = 3       # تعداد پارتیشن روزانه‌ای که از قبل ساخته می‌شود
+AUDIT_ARCHIVE_DIR = "audit_archive"   # محل فایل‌های فشرده بایگانی لاگ
+AUDIT_MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# -- جستجو --
+SEARCH_PAGE_SIZE = 8                  # تعداد نتیجه در هر صفحه کیبورد
+SEARCH_MAX_RESULTS = 200              # سقف نتایجی که از دیتابیس خوانده و کش می‌شود
+SEARCH_CACHE_SIZE = 256               # تعداد عبارت‌های نگه‌داشته‌شده در کش
+SEARCH_CACHE_TTL_SECONDS = 120
+SEARCH_KEPT_PER_USER = 5              # تعداد پیام‌های نتیجه جستجو که هر اپراتور می‌تواند ورق بزند
+
+# -- roster فشرده در حافظه (برای مراسم‌های بسیار بزرگ) --
+ROSTER_ENABLED = False                # اطلاعات شرکت‌کننده از roster خوانده شود نه دیتابیس
+ROSTER_FILE = "roster.bin"            # فایل roster؛ هنگام راه‌اندازی مجدد با mmap باز می‌شود
+
+# -- پروفایل و ثبت عملیات کند (با دستور /profile هم قابل روشن/خاموش شدن است) --
+PROFILING_ENABLED = False
+PROFILE_DIR = "profiles"              # محل لاگ‌های کندی و snapshot‌های CPU
+SLOW_SQL_THRESHOLD_MS = 200           # کوئری‌های کندتر از این مقدار همراه EXPLAIN ثبت می‌شوند
+HANDLER_LATENCY_BUDGET_MS = 1000      # هندلرهای کندتر از این مقدار همراه فراخوانی‌هایشان ثبت می‌شوند
+PROFILE_LOG_MAX_BYTES = 5 * 1024 * 1024
+PROFILE_LOG_BACKUPS = 3
+PROFILE_MAX_SNAPSHOTS = 5
+
 # -- هویت بصری و متون --
 PROGRAM_TITLE = "مراسم معنوی اعتکاف"
 VENUE = "مسجد تن آل عبا"
@@ -56,6 +84,9 @@ REQUEST_INPUT_MESSAGE = """
 INVALID_INPUT_FORMAT = "⛔️ **خطا:** ورودی نامعتبر است. لطفاً کد ملی ۱۰ رقمی یا نام را صحیح وارد نمایید."
 NATIONAL_ID_NOT_FOUND = "⚠️ **توجه:** کد ملی وارد شده در لیست پیش‌ثبت‌نام یافت نشد."
 SEARCH_NO_RESULT = "⚠️ موردی با این مشخصات یافت نشد."
+LOGS_EXPIRED = "⌛️ این گزارش منقضی شده است. لطفاً دستور /logs را دوباره ارسال نمایید."
+SEARCH_TRUNCATED_HINT = "⚠️ تعداد نتایج بیش از حد نمایش است؛ برای یافتن فرد موردنظر عبارت کامل‌تری وارد نمایید."
+SEARCH_EXPIRED = "⌛️ این نتایج جستجو منقضی شده است. لطفاً دوباره جستجو نمایید."
 CHECKIN_SUCCESS_CONFIRMED = "✅ **عملیات موفق:** پذیرش شرکت‌کننده نهایی و ثبت گردید."
 CHECKIN_SUCCESS_REJECTED = "🚫 **عملیات موفق:** درخواست پذیرش رد شد."
 CHECKIN_ALREADY_DONE = "❗️ **هشدار:** این شرکت‌کننده پیش از این پذیرش شده است."
@@ -2,13 +2,115 @@
 import mysql.connector
 from mysql.connector import pooling, errorcode
 import datetime
+import gzip
+import json
+import os
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import config
+import profiling
+import utils
+from roster import CompactRoster, packable as roster_packable
 
 # ایجاد استخر اتصال (Connection Pool) برای جلوگیری از کندی
 db_pool = None
 
+# نسخه فشرده لیست شرکت‌کنندگان در حافظه (فقط اگر ROSTER_ENABLED فعال باشد)
+roster: Optional[CompactRoster] = None
+
+# --- ساختار جدول لاگ ---
+# ایندکس‌ها همگی به timestamp ختم می‌شوند تا فیلتر + مرتب‌سازی نزولی بدون filesort انجام شود
+AUDIT_INDEXES = [
+    "INDEX idx_audit_ts (timestamp, id)",
+    "INDEX idx_audit_action_ts (action, timestamp, id)",
+    "INDEX idx_audit_user_ts (user_id, timestamp, id)",
+    "INDEX idx_audit_nid_ts (national_id, timestamp, id)",
+]
+
+def _partition_name(day: datetime.date) -> str:
+    """نام پارتیشن روزانه؛ مثلا p20240101"""
+    return day.strftime("p%Y%m%d")
+
+def _partition_ddl(day: datetime.date) -> str:
+    """تعریف پارتیشنی که رکوردهای یک روز را نگه می‌دارد"""
+    next_day = day + datetime.timedelta(days=1)
+    return f"PARTITION {_partition_name(day)} VALUES LESS THAN (TO_DAYS('{next_day.isoformat()}'))"
+
+def _partitions_ddl(days: List[datetime.date]) -> str:
+    """
+    پارتیشن‌بندی روزانه برای روزهای داده‌شده (به ترتیب صعودی) به همراه pmax برای هر چیزی خارج از بازه.
+    روزها لازم نیست پشت سر هم باشند؛ هر پارتیشن بازه بعد از پارتیشن قبلی تا پایان روز خودش را می‌گیرد.
+    """
+    parts = [_partition_ddl(d) for d in days]
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (TO_DAYS(timestamp)) (\n    " + ",\n    ".join(parts) + "\n)"
+
+def _upcoming_days() -> List[datetime.date]:
+    """امروز و AUDIT_PARTITIONS_AHEAD_DAYS روز بعد"""
+    today = datetime.date.today()
+    return [today + datetime.timedelta(days=i) for i in range(config.AUDIT_PARTITIONS_AHEAD_DAYS + 1)]
+
+def _migrate_audit_logs(cursor):
+    """
+    تبدیل جدول لاگ نسخه‌های قبلی (INT id، بدون ایندکس و پارتیشن) به ساختار جدید.
+    برای هر روزی که سابقه دارد یک پارتیشن جدا ساخته می‌شود تا maintain_audit_logs
+    سوابق قدیمی‌تر از مهلت نگهداری را روز به روز بایگانی و حذف کند.
+    """
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'audit_logs' AND PARTITION_NAME IS NOT NULL",
+        (config.DB_NAME,)
+    )
+    if cursor.fetchone()[0]:
+        return
+
+    print("⏳ Migrating audit_logs to partitioned layout...")
+    upcoming = _upcoming_days()
+    cursor.execute("SELECT DISTINCT DATE(timestamp) FROM audit_logs WHERE timestamp < %s ORDER BY 1", (upcoming[0],))
+    past_days = [row[0] for row in cursor.fetchall()]
+
+    # یک ALTER تا جدول فقط یک بار بازنویسی شود
+    cursor.execute(f"""
+        ALTER TABLE audit_logs
+            MODIFY id BIGINT NOT NULL AUTO_INCREMENT,
+            MODIFY timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (id, timestamp),
+            {", ".join("ADD " + idx for idx in AUDIT_INDEXES)}
+        {_partitions_ddl(past_days + upcoming)}
+    """)
+    print("✅ audit_logs migrated.")
+
+# نام و نام پدر نرمال‌شده (utils.participant_search_key) برای جستجو؛ collation باینری باعث می‌شود
+# LIKE در دیتابیس دقیقاً همان مقایسه‌ی زیررشته پایتون روی همین مقدار باشد (search.py به آن تکیه دارد)
+SEARCH_KEY_COLUMN_DDL = "search_key VARCHAR(1024) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin"
+
+def _migrate_participants_search_key(conn):
+    """افزودن ستون search_key به جدول نسخه‌های قبلی و پر کردن ردیف‌هایی که مقدار ندارند"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'participants' AND COLUMN_NAME = 'search_key'",
+            (config.DB_NAME,)
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE participants ADD COLUMN {SEARCH_KEY_COLUMN_DDL}")
+
+        # ردیف‌هایی که بیرون از ربات وارد شده‌اند هم در هر راه‌اندازی پر می‌شوند
+        while True:
+            cursor.execute("SELECT national_id, full_name, father_name FROM participants WHERE search_key IS NULL LIMIT 5000")
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany(
+                "UPDATE participants SET search_key = %s WHERE national_id = %s",
+                [(utils.participant_search_key(full_name, father_name), national_id) for national_id, full_name, father_name in rows]
+            )
+            conn.commit()
+    finally:
+        cursor.close()
+
 def initialize_database():
     global db_pool
     try:
@@ -22,12 +124,13 @@ def initialize_database():
         
         # جداول
         queries = [
-            """CREATE TABLE IF NOT EXISTS participants (
+            f"""CREATE TABLE IF NOT EXISTS participants (
                 national_id VARCHAR(10) PRIMARY KEY,
                 full_name VARCHAR(255) NOT NULL,
                 father_name VARCHAR(255),
                 payment_status VARCHAR(20) DEFAULT 'unpaid',
-                imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                {SEARCH_KEY_COLUMN_DDL}
             ) ENGINE=InnoDB CHARACTER SET=utf8mb4;""",
             
             """CREATE TABLE IF NOT EXISTS checkins (
@@ -45,20 +148,34 @@ def initialize_database():
                 locked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 expires_at TIMESTAMP
             ) ENGINE=InnoDB CHARACTER SET=utf8mb4;""",
-            
-            """CREATE TABLE IF NOT EXISTS audit_logs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
+
+            # جدول لاگ به تفکیک روز پارتیشن‌بندی می‌شود تا حذف لاگ‌های قدیمی فقط یک DROP PARTITION باشد
+            f"""CREATE TABLE IF NOT EXISTS audit_logs (
+                id BIGINT NOT NULL AUTO_INCREMENT,
                 action VARCHAR(50) NOT NULL,
                 user_id VARCHAR(50),
                 national_id VARCHAR(10),
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                details TEXT
-            ) ENGINE=InnoDB CHARACTER SET=utf8mb4;"""
+                timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                details TEXT,
+                PRIMARY KEY (id, timestamp),
+                {", ".join(AUDIT_INDEXES)}
+            ) ENGINE=InnoDB CHARACTER SET=utf8mb4
+            {_partitions_ddl(_upcoming_days())};"""
         ]
-        
+
         for q in queries:
             cursor.execute(q)
-            
+
+        # خطای مهاجرت نباید کل ربات را از کار بیندازد؛ جدول قدیمی همچنان قابل استفاده است
+        try:
+            _migrate_audit_logs(cursor)
+        except mysql.connector.Error as err:
+            print(f"❌ audit_logs Migration Error: {err}")
+        try:
+            _migrate_participants_search_key(tmp_conn)
+        except mysql.connector.Error as err:
+            print(f"❌ participants Migration Error: {err}")
+
         tmp_conn.close()
         
         # راه اندازی Pool
@@ -80,42 +197,282 @@ def get_connection():
     global db_pool
     if not db_pool:
         initialize_database()
-    return db_pool.get_connection()
+    conn = db_pool.get_connection()
+    if profiling.is_enabled():
+        return profiling.ProfiledConnection(conn, _explain_statement)
+    return conn
+
+# کانکشن اختصاصی EXPLAIN؛ فقط از رشته slow_sql در profiling استفاده می‌شود
+_explain_conn = None
+
+def _explain_statement(sql: str, params) -> List[tuple]:
+    """
+    پلن اجرای یک کوئری کند برای لاگ پروفایل. روی کانکشن جداگانه اجرا می‌شود چون نتایج
+    کوئری اصلی ممکن است هنوز خوانده نشده باشند و استخر هم نباید برای آن اشغال شود.
+    """
+    global _explain_conn
+    if sql.split(None, 1)[0].upper() not in ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE"):
+        return []
+    if _explain_conn is None or not _explain_conn.is_connected():
+        _explain_conn = mysql.connector.connect(
+            host=config.DB_HOST, database=config.DB_NAME, user=config.DB_USER, password=config.DB_PASSWORD
+        )
+    cursor = _explain_conn.cursor()
+    try:
+        cursor.execute("EXPLAIN " + sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
 
 # --- توابع اصلی ---
 
-def search_participants(query: str) -> List[Dict]:
-    """جستجوی شرکت‌کننده با نام یا بخشی از نام"""
+def search_participants(query: str, limit: int = 10) -> List[Dict]:
+    """
+    جستجوی شرکت‌کننده با نام یا بخشی از نام یا نام پدر.
+    query باید با utils.normalize_search_text نرمال شده باشد؛ مقایسه روی ستون search_key انجام می‌شود.
+    """
     conn = get_connection()
     cursor = conn.cursor(dictionary=True)
-    # جستجوی امن با پارامتر
-    sql = "SELECT * FROM participants WHERE full_name LIKE %s OR father_name LIKE %s LIMIT 10"
-    like_query = f"%{query}%"
-    cursor.execute(sql, (like_query, like_query))
+    # جستجوی امن با پارامتر؛ % و _ در متن کاربر به صورت حرف معمولی جستجو می‌شوند نه wildcard
+    sql = """SELECT national_id, full_name, father_name, payment_status FROM participants
+             WHERE search_key LIKE %s ESCAPE '\\\\'
+             ORDER BY full_name, national_id LIMIT %s"""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    cursor.execute(sql, (f"%{escaped}%", limit))
     results = cursor.fetchall()
     cursor.close()
     conn.close()
     return results
 
-def get_recent_logs(limit=15) -> str:
-    """دریافت آخرین لاگ‌ها برای ادمین"""
+def get_logs_page(limit: int = config.LOGS_PAGE_SIZE,
+                  before: Optional[Tuple[datetime.datetime, int]] = None,
+                  action: Optional[str] = None,
+                  user_id: Optional[str] = None,
+                  national_id: Optional[str] = None) -> Tuple[List[Dict], Optional[Tuple[datetime.datetime, int]]]:
+    """
+    یک صفحه از لاگ‌ها (جدیدترین اول) با صفحه‌بندی keyset.
+    before مکان‌نمای (timestamp, id) آخرین رکورد صفحه قبل است و خروجی دوم مکان‌نمای صفحه بعد
+    (یا None اگر صفحه دیگری نباشد). به جای OFFSET از مکان‌نما استفاده می‌شود تا
+    هزینه هر صفحه مستقل از عمق آن باشد.
+    """
+    conditions = []
+    params = []
+    if action:
+        conditions.append("action = %s")
+        params.append(action)
+    if user_id:
+        conditions.append("user_id = %s")
+        params.append(str(user_id))
+    if national_id:
+        conditions.append("national_id = %s")
+        params.append(national_id)
+    if before:
+        before_ts, before_id = before
+        conditions.append("(timestamp < %s OR (timestamp = %s AND id < %s))")
+        params.extend([before_ts, before_ts, before_id])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
+        SELECT id, action, user_id, national_id, timestamp
+        FROM audit_logs
+        {where}
+        ORDER BY timestamp DESC, id DESC
+        LIMIT %s
+    """
+    params.append(limit + 1) # یک رکورد اضافه فقط برای فهمیدن وجود صفحه بعد
+
     conn = get_connection()
     cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT %s", (limit,))
+    cursor.execute(sql, tuple(params))
     logs = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    
-    report = "📋 **آخرین رخدادهای سیستم:**\n\n"
+    cursor.close(); conn.close()
+
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = (logs[-1]['timestamp'], logs[-1]['id'])
+    return logs, next_cursor
+
+def format_logs_report(logs: List[Dict], title: str = "📋 **آخرین رخدادهای سیستم:**") -> str:
+    """ساخت متن گزارش لاگ برای ارسال در پیام"""
+    lines = [title, ""]
     for log in logs:
-        time_str = log['timestamp'].strftime("%H:%M:%S")
-        report += f"🔹 `{time_str}` | {log['action']} | {log['user_id']}\n"
-    return report
+        time_str = log['timestamp'].strftime("%m-%d %H:%M:%S")
+        line = f"🔹 `{time_str}` | `{log['action']}` | {log['user_id']}"
+        if log['national_id']:
+            line += f" | `{log['national_id']}`"
+        lines.append(line)
+    if not logs:
+        lines.append("موردی یافت نشد.")
+    return "\n".join(lines) + "\n"
+
+# --- نگهداری جدول لاگ (پارتیشن‌های آینده، بایگانی و حذف پارتیشن‌های قدیمی) ---
+
+def _get_audit_partitions(cursor) -> Dict[str, datetime.date]:
+    """نام پارتیشن‌های روزانه موجود به همراه روز متناظر (بدون pmax)"""
+    cursor.execute(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'audit_logs' AND PARTITION_NAME IS NOT NULL",
+        (config.DB_NAME,)
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        if name == 'pmax':
+            continue
+        partitions[name] = datetime.datetime.strptime(name, "p%Y%m%d").date()
+    return partitions
+
+def _archive_audit_partition(conn, name: str) -> str:
+    """بایگانی رکوردهای یک پارتیشن در فایل فشرده jsonl.gz و برگرداندن مسیر فایل"""
+    os.makedirs(config.AUDIT_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(config.AUDIT_ARCHIVE_DIR, f"audit_logs_{name[1:]}.jsonl.gz")
+    tmp_path = path + ".tmp"
+
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT * FROM audit_logs PARTITION ({name}) ORDER BY id")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    row['timestamp'] = row['timestamp'].isoformat()
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        cursor.close()
+
+    # اگر فایل بایگانی آن روز از قبل هست (اجرای ناقص قبلی)، محتوای جدید به آن اضافه می‌شود
+    if os.path.exists(path):
+        with open(path, "ab") as dst, open(tmp_path, "rb") as src:
+            dst.write(src.read())
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    return path
+
+def maintain_audit_logs():
+    """
+    ساخت پارتیشن‌های روزهای آینده و بایگانی + حذف پارتیشن‌های قدیمی‌تر از AUDIT_RETENTION_DAYS.
+    هنگام شروع ربات و سپس هر AUDIT_MAINTENANCE_INTERVAL_SECONDS اجرا می‌شود
+    (در job queue از طریق asyncio.to_thread تا event loop مسدود نشود).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        partitions = _get_audit_partitions(cursor)
+        today = datetime.date.today()
+
+        # 1. پارتیشن‌های آینده (از pmax جدا می‌شوند)
+        last_day = max(partitions.values(), default=today - datetime.timedelta(days=1))
+        start = max(last_day + datetime.timedelta(days=1), today)
+        new_days = []
+        day = start
+        while day <= today + datetime.timedelta(days=config.AUDIT_PARTITIONS_AHEAD_DAYS):
+            new_days.append(day)
+            day += datetime.timedelta(days=1)
+        if new_days:
+            parts = [_partition_ddl(d) for d in new_days]
+            parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+            cursor.execute(f"ALTER TABLE audit_logs REORGANIZE PARTITION pmax INTO ({', '.join(parts)})")
+
+        # 2. بایگانی و حذف پارتیشن‌های منقضی
+        cutoff = today - datetime.timedelta(days=config.AUDIT_RETENTION_DAYS)
+        for name, day in sorted(partitions.items(), key=lambda item: item[1]):
+            if day >= cutoff:
+                break
+            path = _archive_audit_partition(conn, name)
+            cursor.execute(f"ALTER TABLE audit_logs DROP PARTITION {name}")
+            print(f"🗄 Archived audit partition {name} -> {path}")
+    except Exception as e:
+        print(f"Audit Maintenance Error: {e}")
+    finally:
+        cursor.close(); conn.close()
 
 # (بقیه توابع باید دقیقاً مثل قبل باشند ولی به جای connect() از get_connection() استفاده کنند)
 # برای سادگی کار شما، توابع مهم را اینجا بازنویسی می‌کنم که کپی کنید:
 
+# --- roster فشرده ---
+
+def _roster_fingerprint(cursor) -> Tuple[int, int]:
+    """
+    امضای وضعیت جدول شرکت‌کنندگان برای تشخیص کهنه بودن فایل roster.
+    CHECKSUM TABLE با هر تغییر محتوا (از جمله payment_status در ON DUPLICATE KEY UPDATE) عوض می‌شود؛
+    هزینه آن یک پیمایش جدول است و فقط هنگام شروع و ساخت roster اجرا می‌شود.
+    """
+    cursor.execute("SELECT COUNT(*) FROM participants")
+    count = cursor.fetchone()[0]
+    cursor.execute("CHECKSUM TABLE participants")
+    checksum = cursor.fetchone()[1] or 0
+    # هدر فایل امضا را int64 علامت‌دار نگه می‌دارد
+    return int(count), int(checksum) & 0x7FFFFFFFFFFFFFFF
+
+def _iter_participant_rows(cursor, batch_size: int = 5000):
+    """
+    خواندن تدریجی ردیف‌ها به صورت تاپل (نه dict) تا کل جدول یکجا در حافظه پایتون نباشد.
+    ترتیب national_id (رشته‌های ۱۰ رقمی) همان ترتیب عددی مورد نیاز CompactRoster است.
+    """
+    cursor.execute("SELECT national_id, full_name, father_name, payment_status FROM participants ORDER BY national_id")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+def refresh_roster():
+    """
+    ساخت مجدد فایل roster از دیتابیس و جایگزینی نسخه در حافظه.
+    در صورت خطا roster و فایل آن کنار گذاشته می‌شوند تا داده کهنه نمایش داده نشود (برگشت به دیتابیس).
+    """
+    global roster
+    old_roster, new_roster = roster, None
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        fingerprint = _roster_fingerprint(cursor)
+        new_roster = CompactRoster.build_file(config.ROSTER_FILE, _iter_participant_rows(cursor), fingerprint)
+        print(f"✅ Roster built: {len(new_roster)} participants.")
+    except Exception as e:
+        print(f"Roster Error: {e}")
+        # فایل قبلی دیگر با دیتابیس هم‌خوان نیست و نباید در راه‌اندازی بعدی استفاده شود
+        if os.path.exists(config.ROSTER_FILE):
+            os.remove(config.ROSTER_FILE)
+    finally:
+        cursor.close(); conn.close()
+
+    roster = new_roster
+    if old_roster is not None:
+        old_roster.close()
+
+def load_roster():
+    """
+    بارگذاری roster هنگام شروع: اگر فایل موجود با دیتابیس هم‌خوان باشد فقط mmap می‌شود
+    (راه‌اندازی مجدد فوری)، در غیر این صورت از نو ساخته می‌شود.
+    """
+    global roster
+    if not config.ROSTER_ENABLED:
+        return
+    if os.path.exists(config.ROSTER_FILE):
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            fingerprint = _roster_fingerprint(cursor)
+            cached = CompactRoster.open(config.ROSTER_FILE)
+            if cached.fingerprint == fingerprint:
+                roster = cached
+                print(f"✅ Roster loaded from {config.ROSTER_FILE}: {len(roster)} participants.")
+                return
+            cached.close()
+        except Exception as e:
+            print(f"Roster Error: {e}")
+        finally:
+            cursor.close(); conn.close()
+    refresh_roster()
+
 def get_participant_info(national_id: str) -> Optional[Dict]:
+    # کد ملی‌هایی که roster نمی‌تواند نگه دارد (غیر ۱۰ رقمی) همیشه از دیتابیس خوانده می‌شوند
+    if roster is not None and roster_packable(national_id):
+        return roster.get(national_id)
     conn = get_connection()
     cursor = conn.cursor(dictionary=True)
     cursor.execute("SELECT * FROM participants WHERE national_id = %s", (national_id,))
@@ -223,28 +580,29 @@ def import_participants_from_dataframe(df: pd.DataFrame):
         df['payment_status'] = df['payment_status'].astype(str)
 
         insert_query = """
-            INSERT INTO participants (national_id, full_name, father_name, payment_status)
-            VALUES (%s, %s, %s, %s)
+            INSERT INTO participants (national_id, full_name, father_name, payment_status, search_key)
+            VALUES (%s, %s, %s, %s, %s)
             ON DUPLICATE KEY UPDATE
                 full_name = VALUES(full_name),
                 father_name = VALUES(father_name),
-                payment_status = VALUES(payment_status)
+                payment_status = VALUES(payment_status),
+                search_key = VALUES(search_key)
         """
         
-        # تبدیل به لیست تاپل
-        data_tuples = []
-        for _, row in df.iterrows():
-            data_tuples.append((
-                row['national_id'], 
-                row['full_name'], 
-                row['father_name'], 
-                row['payment_status']
-            ))
-        
+        # تبدیل به لیست تاپل (itertuples برخلاف iterrows برای هر ردیف Series نمی‌سازد)
+        data_tuples = [
+            (national_id, full_name, father_name, payment_status, utils.participant_search_key(full_name, father_name))
+            for national_id, full_name, father_name, payment_status
+            in df[['national_id', 'full_name', 'father_name', 'payment_status']].itertuples(index=False, name=None)
+        ]
+
         cursor.executemany(insert_query, data_tuples)
         conn.commit()
         print(f"✅ Successfully imported {len(data_tuples)} rows.")
-        
+
+        if config.ROSTER_ENABLED:
+            refresh_roster()
+
     except Exception as e:
         print(f"❌ Import Error: {e}")
         raise e # خطا را برگردان تا هندلر بفهمد
@@ -2,45 +2,118 @@
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardButton, InlineKeyboardMarkup, InputFile
 from telegram.ext import Application, CommandHandler, MessageHandler, ConversationHandler, CallbackQueryHandler, ContextTypes, filters
 import io
+import datetime
+import functools
+import itertools
 import pandas as pd # اضافه شده برای جلوگیری از خطا
 
 import config
 import database as db
+import profiling
+import search
 import utils
 
 (AWAITING_INPUT, AWAITING_CONFIRMATION, AWAITING_FILE) = range(3)
 
 def restricted(user_roles: list):
     def decorator(func):
+        @functools.wraps(func)
         async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
             if not update.effective_user: return
             user_id = update.effective_user.id
             if user_id in user_roles:
                 return await func(update, context, *args, **kwargs)
             else:
-                await update.message.reply_text("⛔️ **دسترسی غیرمجاز:** شناسه کاربری شما در سیستم تعریف نشده است.")
+                await update.effective_message.reply_text("⛔️ **دسترسی غیرمجاز:** شناسه کاربری شما در سیستم تعریف نشده است.")
                 db.log_action("access_denied", user_id)
         return wrapped
     return decorator
 
 # --- Command Handlers ---
 
+@profiling.profiled
 @restricted(user_roles=config.ADMIN_USER_IDS + config.OPERATOR_USER_IDS)
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     await update.message.reply_text(config.WELCOME_MESSAGE, parse_mode='Markdown')
     await update.message.reply_text(config.REQUEST_INPUT_MESSAGE, parse_mode='Markdown')
     return AWAITING_INPUT
 
+@profiling.profiled
 @restricted(user_roles=config.ADMIN_USER_IDS + config.OPERATOR_USER_IDS)
 async def about_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(config.ABOUT_MESSAGE, parse_mode='Markdown')
 
+LOGS_FILTER_KEYS = {'action': 'action', 'user': 'user_id', 'nid': 'national_id'}
+LOGS_CURSOR_FORMAT = "%Y%m%d%H%M%S"
+
+# هر پیام /logs فیلترهای خودش را با یک شناسه در bot_data دارد (نه یک جای مشترک در user_data)
+# تا /logs بعدی یا user_data.clear() بعد از پذیرش، صفحه‌بندی پیام‌های قبلی را عوض نکند
+_logs_tokens = itertools.count(1)
+
+def _remember_log_filters(context: ContextTypes.DEFAULT_TYPE, log_filters: dict) -> int:
+    """ذخیره فیلترهای یک پیام /logs؛ فقط LOGS_VIEWS_KEPT پیام آخر نگه داشته می‌شود"""
+    views = context.bot_data.setdefault('logs_views', {})
+    token = next(_logs_tokens)
+    views[token] = log_filters
+    for old_token in sorted(views)[:-config.LOGS_VIEWS_KEPT]:
+        del views[old_token]
+    return token
+
+def _logs_page(log_filters: dict, token: int, before=None):
+    """متن و کیبورد یک صفحه از لاگ‌ها؛ دکمه «قدیمی‌تر» شناسه فیلترها و مکان‌نمای صفحه بعد را در callback_data دارد"""
+    logs, next_cursor = db.get_logs_page(before=before, **log_filters)
+    report = db.format_logs_report(logs)
+    keyboard = []
+    if next_cursor:
+        ts, log_id = next_cursor
+        keyboard.append(InlineKeyboardButton("⬅️ قدیمی‌تر", callback_data=f"logs_{token}_next_{ts.strftime(LOGS_CURSOR_FORMAT)}_{log_id}"))
+    if before:
+        keyboard.append(InlineKeyboardButton("⏮ جدیدترین", callback_data=f"logs_{token}_first"))
+    markup = InlineKeyboardMarkup([keyboard]) if keyboard else None
+    return report, markup
+
+@profiling.profiled
 @restricted(user_roles=config.ADMIN_USER_IDS)
 async def logs_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """دستور جدید برای دیدن لاگ‌ها"""
-    report = db.get_recent_logs()
-    await update.message.reply_text(report, parse_mode='Markdown')
+    """
+    دیدن لاگ‌ها با فیلتر اختیاری، مثلا:
+    /logs action=checkin_confirmed user=123456 nid=0012345678
+    """
+    log_filters = {}
+    for arg in context.args or []:
+        key, _, value = arg.partition('=')
+        if key not in LOGS_FILTER_KEYS or not value:
+            await update.message.reply_text("⛔️ **خطا:** فیلتر نامعتبر. فیلترهای مجاز: action=، user=، nid=", parse_mode='Markdown')
+            return
+        log_filters[LOGS_FILTER_KEYS[key]] = value
+
+    token = _remember_log_filters(context, log_filters)
+    report, markup = _logs_page(log_filters, token)
+    await update.message.reply_text(report, reply_markup=markup, parse_mode='Markdown')
+
+@profiling.profiled
+@restricted(user_roles=config.ADMIN_USER_IDS)
+async def logs_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """صفحه‌بندی لاگ‌ها از طریق دکمه‌های شیشه‌ای"""
+    query = update.callback_query
+    await query.answer()
+
+    # logs_<token>_first یا logs_<token>_next_<timestamp>_<id>
+    parts = query.data.split("_")
+    token = int(parts[1])
+    log_filters = context.bot_data.get('logs_views', {}).get(token)
+    if log_filters is None:
+        await query.edit_message_text(config.LOGS_EXPIRED)
+        return
+
+    before = None
+    if parts[2] == "next":
+        before = (datetime.datetime.strptime(parts[3], LOGS_CURSOR_FORMAT), int(parts[4]))
 
+    report, markup = _logs_page(log_filters, token, before)
+    await query.edit_message_text(report, reply_markup=markup, parse_mode='Markdown')
+
+@profiling.profiled
 @restricted(user_roles=config.ADMIN_USER_IDS)
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     stats = db.get_live_stats()
@@ -59,11 +132,13 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     await update.message.reply_text(msg, parse_mode='Markdown')
 
+@profiling.profiled
 @restricted(user_roles=config.ADMIN_USER_IDS)
 async def upload_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     await update.message.reply_text("📂 لطفاً فایل اکسل لیست نفرات را ارسال نمایید.")
     return AWAITING_FILE
 
+@profiling.profiled
 @restricted(user_roles=config.ADMIN_USER_IDS)
 async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     status_msg = await update.message.reply_text("⏳ در حال تولید گزارش خروجی...")
@@ -94,7 +169,43 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await context.bot.delete_message(chat_id=update.effective_chat.id, message_id=status_msg.message_id)
 
+@profiling.profiled
+@restricted(user_roles=config.ADMIN_USER_IDS)
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    مدیریت حالت پروفایل:
+    /profile on | off — روشن/خاموش کردن
+    /profile download — دریافت لاگ‌های کندی و snapshot‌های CPU در یک فایل zip
+    /profile — وضعیت فعلی
+    """
+    arg = context.args[0].lower() if context.args else ""
+    if arg == "on":
+        profiling.enable()
+        db.log_action("profiling_on", update.effective_user.id)
+    elif arg == "off":
+        profiling.disable()
+        db.log_action("profiling_off", update.effective_user.id)
+    elif arg == "download":
+        archive = profiling.export_archive()
+        await update.message.reply_document(
+            document=InputFile(archive, filename=datetime.datetime.now().strftime("profile_%Y%m%d_%H%M%S.zip")),
+            caption="🔬 فایل‌های پروفایل و عملیات کند"
+        )
+        return
+    elif arg:
+        await update.message.reply_text("⛔️ **خطا:** گزینه نامعتبر. گزینه‌های مجاز: on، off، download", parse_mode='Markdown')
+        return
+
+    state = "🟢 فعال" if profiling.is_enabled() else "⚪️ غیرفعال"
+    await update.message.reply_text(
+        f"""🔬 **وضعیت پروفایل:** {state}
 
+⏱ آستانه کوئری کند: {config.SLOW_SQL_THRESHOLD_MS}ms
+⏱ بودجه زمانی هندلر: {config.HANDLER_LATENCY_BUDGET_MS}ms""",
+        parse_mode='Markdown'
+    )
+
+@profiling.profiled
 async def handle_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """مدیریت هوشمند ورودی (کد ملی یا جستجو)"""
     user_id = update.effective_user.id
@@ -106,30 +217,62 @@ async def handle_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     
     # حالت ۲: ورودی جستجو است (متن یا عدد غیر ۱۰ رقمی)
     elif len(text) >= 2:
-        results = db.search_participants(text)
+        results, truncated = search.search(text)
         if not results:
             await update.message.reply_text(config.SEARCH_NO_RESULT)
             return AWAITING_INPUT
-        
-        msg = "🔍 **نتایج جستجو:**\n\n"
-        keyboard = []
-        for p in results:
-            # دکمه شیشه‌ای برای انتخاب سریع
-            btn_text = f"{p['full_name']} ({p['national_id']})"
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"select_{p['national_id']}")])
-        
-        keyboard.append([InlineKeyboardButton("❌ انصراف", callback_data="cancel")])
-        await update.message.reply_text(
-            msg + "جهت انتخاب روی نام فرد کلیک کنید:",
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
-        )
+
+        token = _remember_search(context, results, truncated)
+        msg, markup = _search_page(results, truncated, token, 0)
+        await update.message.reply_text(msg, reply_markup=markup, parse_mode='Markdown')
         return AWAITING_CONFIRMATION # می‌رویم به حالت انتظار کلیک
-        
+
     else:
         await update.message.reply_text(config.INVALID_INPUT_FORMAT)
         return AWAITING_INPUT
 
+# شناسه پیام‌های نتیجه جستجو؛ سراسری است تا با user_data.clear() بعد از پذیرش از نو شروع نشود
+# و دکمه‌های یک پیام قدیمی هرگز به نتایج جستجوی دیگری اشاره نکنند
+_search_tokens = itertools.count(1)
+
+def _remember_search(context: ContextTypes.DEFAULT_TYPE, results: list, truncated: bool) -> int:
+    """
+    نگهداری فهرست نتایج هر پیام جستجو در user_data با یک شناسه؛ دکمه‌های صفحه‌بندی همان
+    فهرست را ورق می‌زنند (بدون کوئری جدید، حتی بعد از انقضای کش) و پیام‌های قدیمی‌تر
+    نتایج خودشان را نشان می‌دهند. فقط SEARCH_KEPT_PER_USER جستجوی آخر نگه داشته می‌شود.
+    """
+    searches = context.user_data.setdefault('searches', {})
+    token = next(_search_tokens)
+    searches[token] = (results, truncated)
+    for old_token in sorted(searches)[:-config.SEARCH_KEPT_PER_USER]:
+        del searches[old_token]
+    return token
+
+def _search_page(results: list, truncated: bool, token: int, page: int):
+    """متن و کیبورد شیشه‌ای یک صفحه از نتایج جستجو با دکمه‌های قبلی/بعدی"""
+    rows, page, total_pages = search.get_page(results, page)
+    keyboard = []
+    for p in rows:
+        # دکمه شیشه‌ای برای انتخاب سریع
+        btn_text = f"{p['full_name']} ({p['national_id']})"
+        keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"select_{p['national_id']}")])
+
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton("➡️ قبلی", callback_data=f"page_{token}_{page - 1}"))
+    if page < total_pages - 1:
+        nav.append(InlineKeyboardButton("بعدی ⬅️", callback_data=f"page_{token}_{page + 1}"))
+    if nav:
+        keyboard.append(nav)
+
+    keyboard.append([InlineKeyboardButton("❌ انصراف", callback_data="cancel")])
+    count = f"{len(results)}+" if truncated else str(len(results))
+    msg = f"🔍 **نتایج جستجو:** ({count} مورد، صفحه {page + 1} از {total_pages})\n\n"
+    if truncated:
+        msg += config.SEARCH_TRUNCATED_HINT + "\n\n"
+    msg += "جهت انتخاب روی نام فرد کلیک کنید:"
+    return msg, InlineKeyboardMarkup(keyboard)
+
 async def process_national_id(update: Update, context: ContextTypes.DEFAULT_TYPE, national_id: str):
     user_id = update.effective_user.id
     
@@ -198,6 +341,7 @@ async def process_national_id(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 
 
+@profiling.profiled
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
     await query.answer()
@@ -217,6 +361,18 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         nid = data.split("_")[1]
         return await process_national_id(update, context, nid)
 
+    # ورق زدن نتایج جستجو (از فهرست ذخیره‌شده همان پیام، بدون کوئری جدید)
+    if data.startswith("page_"):
+        _, token, page = data.split("_")
+        stored = context.user_data.get('searches', {}).get(int(token))
+        if stored is None:
+            await query.edit_message_text(config.SEARCH_EXPIRED)
+            return AWAITING_INPUT
+        results, truncated = stored
+        msg, markup = _search_page(results, truncated, int(token), int(page))
+        await query.edit_message_text(msg, reply_markup=markup, parse_mode='Markdown')
+        return AWAITING_CONFIRMATION
+
     # هندل کردن عملیات پذیرش
     action, _, national_id = data.partition('_')
     
@@ -240,6 +396,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await context.bot.send_message(chat_id=user_id, text=config.REQUEST_INPUT_MESSAGE, parse_mode='Markdown')
     return AWAITING_INPUT
 
+@profiling.profiled
 async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     document = update.message.document
     file = await document.get_file()
@@ -248,12 +405,14 @@ async def handle_file_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     if df is not None:
         db.import_participants_from_dataframe(df)
+        search.invalidate() # نتایج کش‌شده دیگر معتبر نیستند
         await update.message.reply_text(f"✅ **بارگذاری موفق:** اطلاعات {len(df)} نفر در پایگاه داده به‌روزرسانی شد.")
     else:
         await update.message.reply_text("❌ خطا در ساختار فایل اکسل.")
         
     return ConversationHandler.END
 
+@profiling.profiled
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if 'national_id' in context.user_data:
         db.release_soft_lock(context.user_data['national_id'])
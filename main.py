@@ -1,17 +1,31 @@
 # main.py
 from telegram.ext import Application, ConversationHandler, CommandHandler, MessageHandler, filters, CallbackQueryHandler
+import asyncio
 import config
 import handlers
 import database as db
+import profiling
+
+async def _post_init(application: Application) -> None:
+    if config.PROFILING_ENABLED:
+        # پروفایلر CPU باید روی رشته‌ای که event loop را اجرا می‌کند روشن شود
+        profiling.enable()
+
+async def _audit_maintenance_job(context) -> None:
+    # بایگانی و ALTER پارتیشن‌ها طول می‌کشد؛ در رشته جدا اجرا می‌شود تا پذیرش‌ها منتظر نمانند
+    await asyncio.to_thread(db.maintain_audit_logs)
 
 def main() -> None:
     db.initialize_database()
+    db.load_roster()
 
     application = (
         Application.builder()
         .token(config.BOT_TOKEN)
         .base_url(f"{config.BALE_API_BASE_URL}bot")
         .base_file_url(f"{config.BALE_API_BASE_URL}file/bot")
+        .request(profiling.ProfiledRequest(connection_pool_size=256)) # زمان‌سنجی درخواست‌ها به بله در حالت پروفایل
+        .post_init(_post_init)
         .build()
     )
 
@@ -40,6 +54,8 @@ def main() -> None:
         fallbacks=[CommandHandler("cancel", handlers.cancel)],
     )
     
+    # صفحه‌بندی لاگ‌ها باید قبل از مکالمه پذیرش ثبت شود تا کلیک‌ها به handle_callback نرسند
+    application.add_handler(CallbackQueryHandler(handlers.logs_page_callback, pattern=r"^logs_"))
     application.add_handler(checkin_conv_handler)
     application.add_handler(upload_conv_handler)
     
@@ -48,6 +64,16 @@ def main() -> None:
     application.add_handler(CommandHandler("stats", handlers.stats_command))
     application.add_handler(CommandHandler("export", handlers.export_command))
     application.add_handler(CommandHandler("logs", handlers.logs_command)) # دستور لاگ
+    application.add_handler(CommandHandler("profile", handlers.profile_command)) # پروفایل و عملیات کند
+
+    # نگهداری جدول لاگ: یک بار هنگام شروع و سپس به صورت دوره‌ای
+    db.maintain_audit_logs()
+    if application.job_queue:
+        application.job_queue.run_repeating(
+            _audit_maintenance_job,
+            interval=config.AUDIT_MAINTENANCE_INTERVAL_SECONDS,
+            first=config.AUDIT_MAINTENANCE_INTERVAL_SECONDS
+        )
 
     print(f"Bale Bot Started for {config.PROGRAM_TITLE}...")
     application.run_polling()
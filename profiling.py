@@ -0,0 +1,230 @@
+# profiling.py
+# حالت پروفایل اختیاری برای بررسی کندی‌ها پس از مراسم
+# - پروفایل CPU کل پردازه (yappi اگر نصب باشد، وگرنه cProfile)
+# - ثبت کوئری‌های کندتر از SLOW_SQL_THRESHOLD_MS به همراه EXPLAIN
+# - ثبت هندلرهای کندتر از HANDLER_LATENCY_BUDGET_MS به همراه فهرست فراخوانی‌های دیتابیس و بله
+# همه خروجی‌ها در PROFILE_DIR با چرخش فایل نوشته می‌شوند و با دستور /profile قابل دریافت‌اند.
+import contextvars
+import cProfile
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import glob
+import io
+import logging
+import os
+import pstats
+import time
+import zipfile
+from logging.handlers import RotatingFileHandler
+from typing import Callable, List, Optional, Tuple
+
+from telegram.request import HTTPXRequest
+
+import config
+
+try:
+    import yappi  # پروفایلر آگاه از asyncio (اختیاری)
+except ImportError:
+    yappi = None
+
+_enabled = False
+_cpu_profiler: Optional[cProfile.Profile] = None
+
+# EXPLAIN و نوشتن لاگ کوئری کند در یک رشته جدا انجام می‌شود تا زمان هندلرِ در حال اندازه‌گیری را بالا نبرد
+_slow_sql_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow_sql")
+
+# فراخوانی‌های ثبت‌شده در هندلر جاری: (شروع نسبت به هندلر، نوع، شرح، مدت) همه بر حسب میلی‌ثانیه
+_current_trace: contextvars.ContextVar[Optional[Tuple[float, List[Tuple[float, str, str, float]]]]] = \
+    contextvars.ContextVar("profiling_trace", default=None)
+
+def _make_logger(name: str, filename: str) -> logging.Logger:
+    logger = logging.getLogger(f"profiling.{name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(config.PROFILE_DIR, filename),
+            maxBytes=config.PROFILE_LOG_MAX_BYTES,
+            backupCount=config.PROFILE_LOG_BACKUPS,
+            encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+def is_enabled() -> bool:
+    return _enabled
+
+def enable():
+    """فعال‌سازی پروفایل؛ باید از رشته event loop صدا زده شود تا پروفایلر CPU هندلرها را ببیند"""
+    global _enabled, _cpu_profiler
+    if _enabled:
+        return
+    if yappi is not None:
+        yappi.set_clock_type("wall")
+        yappi.start()
+    else:
+        _cpu_profiler = cProfile.Profile()
+        _cpu_profiler.enable()
+    _enabled = True
+    print("🔬 Profiling enabled.")
+
+def disable():
+    """توقف پروفایل؛ آمار CPU تا این لحظه در یک snapshot ذخیره می‌شود"""
+    global _enabled, _cpu_profiler
+    if not _enabled:
+        return
+    dump_cpu_profile()
+    if yappi is not None:
+        yappi.stop()
+        yappi.clear_stats()
+    else:
+        _cpu_profiler.disable()
+        _cpu_profiler = None
+    _enabled = False
+    print("🔬 Profiling disabled.")
+
+def dump_cpu_profile() -> Optional[str]:
+    """
+    ذخیره آمار CPU (فرمت pstats برای snakeviz و مشابه آن) و یک خلاصه متنی؛
+    فقط PROFILE_MAX_SNAPSHOTS فایل آخر نگه داشته می‌شود.
+    """
+    if not _enabled:
+        return None
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(config.PROFILE_DIR, time.strftime("cpu_%Y%m%d_%H%M%S.prof"))
+    if yappi is not None:
+        yappi.get_func_stats().save(path, type="pstat")
+    else:
+        # create_stats پروفایلر را متوقف می‌کند؛ بعد از ذخیره دوباره روشن می‌شود
+        _cpu_profiler.dump_stats(path)
+        _cpu_profiler.enable()
+
+    summary = io.StringIO()
+    pstats.Stats(path, stream=summary).sort_stats("cumulative").print_stats(40)
+    with open(path[:-len(".prof")] + ".txt", "w", encoding="utf-8") as f:
+        f.write(summary.getvalue())
+
+    snapshots = sorted(glob.glob(os.path.join(config.PROFILE_DIR, "cpu_*.prof")))
+    for old in snapshots[:-config.PROFILE_MAX_SNAPSHOTS]:
+        os.remove(old)
+        if os.path.exists(old[:-len(".prof")] + ".txt"):
+            os.remove(old[:-len(".prof")] + ".txt")
+    return path
+
+def export_archive() -> io.BytesIO:
+    """همه فایل‌های پروفایل در یک zip درون حافظه برای ارسال به ادمین"""
+    dump_cpu_profile()
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(glob.glob(os.path.join(config.PROFILE_DIR, "*"))):
+            archive.write(path, os.path.basename(path))
+    output.seek(0)
+    return output
+
+def _record_call(kind: str, label: str, started: float, duration_ms: float):
+    trace = _current_trace.get()
+    if trace is not None:
+        handler_start, calls = trace
+        calls.append(((started - handler_start) * 1000, kind, label, duration_ms))
+
+# --- هندلرها ---
+
+def profiled(func):
+    """
+    دکوراتور هندلرها: اگر اجرای هندلر از HANDLER_LATENCY_BUDGET_MS بیشتر شود،
+    مدت کل و فراخوانی‌های دیتابیس و بله داخل آن در slow_handlers.log ثبت می‌شود.
+    """
+    @functools.wraps(func)
+    async def wrapped(update, context, *args, **kwargs):
+        if not _enabled:
+            return await func(update, context, *args, **kwargs)
+
+        calls = []
+        start = time.perf_counter()
+        token = _current_trace.set((start, calls))
+        try:
+            return await func(update, context, *args, **kwargs)
+        finally:
+            _current_trace.reset(token)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms > config.HANDLER_LATENCY_BUDGET_MS:
+                user_id = update.effective_user.id if update.effective_user else None
+                lines = [f"SLOW HANDLER {func.__name__} user={user_id} total={elapsed_ms:.1f}ms"]
+                for offset, kind, label, duration in calls:
+                    lines.append(f"  +{offset:8.1f}ms {kind:4} {duration:8.1f}ms  {label}")
+                _make_logger("handlers", "slow_handlers.log").info("\n".join(lines))
+    return wrapped
+
+# --- SQL ---
+
+def _one_line(sql: str) -> str:
+    return " ".join(sql.split())
+
+class ProfiledCursor:
+    """پوشش cursor دیتابیس برای زمان‌سنجی execute/executemany"""
+
+    def __init__(self, cursor, explain: Callable[[str, Optional[tuple]], List[tuple]]):
+        self._cursor = cursor
+        self._explain = explain
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, method, sql, params, many: bool):
+        started = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            _record_call("sql", _one_line(sql)[:120], started, duration_ms)
+            if duration_ms > config.SLOW_SQL_THRESHOLD_MS:
+                _slow_sql_worker.submit(self._log_slow, sql, params, duration_ms, many)
+
+    def _log_slow(self, sql, params, duration_ms: float, many: bool):
+        lines = [f"SLOW SQL {duration_ms:.1f}ms: {_one_line(sql)}"]
+        if many:
+            lines.append(f"  rows: {len(params)}")
+        else:
+            lines.append(f"  params: {params!r}")
+            try:
+                for row in self._explain(sql, params):
+                    lines.append(f"  EXPLAIN: {row}")
+            except Exception as e:
+                lines.append(f"  EXPLAIN failed: {e}")
+        _make_logger("sql", "slow_sql.log").info("\n".join(lines))
+
+    def execute(self, sql, params=None):
+        return self._timed(self._cursor.execute, sql, params, many=False)
+
+    def executemany(self, sql, params):
+        return self._timed(self._cursor.executemany, sql, params, many=True)
+
+class ProfiledConnection:
+    """پوشش کانکشن استخر که cursor‌های زمان‌سنج برمی‌گرداند"""
+
+    def __init__(self, conn, explain: Callable[[str, Optional[tuple]], List[tuple]]):
+        self._conn = conn
+        self._explain = explain
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return ProfiledCursor(self._conn.cursor(*args, **kwargs), self._explain)
+
+# --- API بله ---
+
+class ProfiledRequest(HTTPXRequest):
+    """زمان‌سنجی درخواست‌های ربات به API بله برای ثبت در فهرست فراخوانی‌های هندلر"""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().do_request(url, method, *args, **kwargs)
+        finally:
+            _record_call("bale", url.rsplit("/", 1)[-1], started, (time.perf_counter() - started) * 1000)
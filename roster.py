@@ -0,0 +1,161 @@
+# roster.py
+# نگهداری فشرده لیست شرکت‌کنندگان در حافظه (ستونی)
+# کد ملی‌ها به صورت عدد ۶۴ بیتی در یک آرایه مرتب (جستجوی دودویی) و نام‌ها در یک بافر
+# پیوسته UTF-8 با آرایه آفست ذخیره می‌شوند. همین چیدمان عیناً در فایل نوشته می‌شود و
+# هنگام راه‌اندازی مجدد با mmap باز می‌شود (بدون پردازش یا کپی).
+#
+# چیدمان فایل (ترتیب بایت بومی سیستم، هر بخش از مضرب ۸ بایت شروع می‌شود):
+#   header | ids: int64[n] | name_offsets: uint32[2n+1] | status_codes: uint16[n] | names | statuses
+# رکورد i: full_name = names[off[2i]:off[2i+1]]، father_name = names[off[2i+1]:off[2i+2]]
+import bisect
+from array import array
+import io
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Optional, Tuple
+
+MAGIC = b"ETKR"
+VERSION = 1
+# magic, version, count, names_size, statuses_size, fingerprint (دو عدد دلخواه برای تشخیص کهنگی)
+_HEADER = struct.Struct("=4sIQQQqq")
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+def packable(national_id: str) -> bool:
+    """
+    فقط کد ملی‌های ۱۰ رقمی با ارقام انگلیسی به عدد تبدیل و در roster نگه داشته می‌شوند.
+    isdigit به تنهایی ارقام فارسی/عربی را هم می‌پذیرد و int آن‌ها را به همان عدد انگلیسی تبدیل می‌کند؛
+    چنین کد ملی‌ای در دیتابیس رشته دیگری است و باید مثل دیتابیس جدا بماند.
+    """
+    return national_id.isascii() and national_id.isdigit() and len(national_id) == 10
+
+class CompactRoster:
+    """لیست فقط‌خواندنی شرکت‌کنندگان با حافظه مصرفی چند ده بایت به ازای هر نفر"""
+
+    def __init__(self, buffer, _mmap: Optional[mmap.mmap] = None):
+        self._mmap = _mmap
+        view = memoryview(buffer)
+        magic, version, count, names_size, statuses_size, fp_a, fp_b = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Invalid roster file")
+
+        self.fingerprint = (fp_a, fp_b)
+        pos = _align(_HEADER.size)
+        self._ids = view[pos:pos + 8 * count].cast("q")
+        pos = _align(pos + 8 * count)
+        self._offsets = view[pos:pos + 4 * (2 * count + 1)].cast("I")
+        pos = _align(pos + 4 * (2 * count + 1))
+        self._codes = view[pos:pos + 2 * count].cast("H")
+        pos = _align(pos + 2 * count)
+        self._names = view[pos:pos + names_size]
+        pos += names_size
+        statuses = bytes(view[pos:pos + statuses_size]).decode("utf-8")
+        # جدول وضعیت پرداخت کوچک است (paid/unpaid/...) و یک بار رمزگشایی می‌شود
+        self._statuses = statuses.split("\n") if statuses_size else []
+
+    # --- ساخت و ذخیره ---
+
+    @staticmethod
+    def _collect(rows: Iterable[Tuple[str, str, str, str]]):
+        """
+        ساخت ستون‌ها از ردیف‌های (national_id, full_name, father_name, payment_status) که به ترتیب
+        national_id مرتب شده‌اند (ORDER BY national_id). ردیف‌ها یکی‌یکی مستقیماً به آرایه‌های
+        فشرده اضافه می‌شوند و هیچ‌گاه کل جدول به شکل اشیای پایتون در حافظه نیست.
+        کد ملی‌هایی که packable نیستند کنار گذاشته می‌شوند.
+        """
+        ids = array("q")
+        offsets = array("I", [0])
+        codes = array("H")
+        names = bytearray()
+        status_table: Dict[str, int] = {}
+        for national_id, full_name, father_name, payment_status in rows:
+            national_id = str(national_id).strip()
+            if not packable(national_id):
+                continue
+            key = int(national_id)
+            if ids and key <= ids[-1]:
+                raise ValueError("Roster rows must be sorted by national_id without duplicates")
+            ids.append(key)
+            names += (full_name or "").encode("utf-8")
+            offsets.append(len(names))
+            names += (father_name or "").encode("utf-8")
+            offsets.append(len(names))
+            codes.append(status_table.setdefault(payment_status or "", len(status_table)))
+        statuses = "\n".join(status_table).encode("utf-8")
+        return ids, offsets, codes, names, statuses
+
+    @classmethod
+    def _write(cls, f, rows: Iterable[Tuple[str, str, str, str]], fingerprint: Tuple[int, int]):
+        """نوشتن چیدمان کامل در یک شیء فایل‌مانند"""
+        ids, offsets, codes, names, statuses = cls._collect(rows)
+        pos = f.write(_HEADER.pack(MAGIC, VERSION, len(ids), len(names), len(statuses), *fingerprint))
+        for section in (ids, offsets, codes):
+            pos += f.write(b"\0" * (_align(pos) - pos))
+            pos += f.write(memoryview(section).cast("B"))
+        f.write(b"\0" * (_align(pos) - pos))
+        f.write(names)
+        f.write(statuses)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, str, str, str]], fingerprint: Tuple[int, int] = (0, 0)) -> "CompactRoster":
+        """ساخت roster در حافظه (بدون فایل) از ردیف‌های مرتب‌شده بر اساس کد ملی"""
+        buffer = io.BytesIO()
+        cls._write(buffer, rows, fingerprint)
+        return cls(buffer.getbuffer())
+
+    @classmethod
+    def build_file(cls, path: str, rows: Iterable[Tuple[str, str, str, str]], fingerprint: Tuple[int, int] = (0, 0)) -> "CompactRoster":
+        """ساخت فایل roster (نوشتن اتمیک) از ردیف‌های مرتب‌شده و باز کردن آن با mmap"""
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                cls._write(f, rows, fingerprint)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str) -> "CompactRoster":
+        """باز کردن فایل roster با mmap؛ صفحات فقط هنگام دسترسی از دیسک خوانده می‌شوند"""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, _mmap=mm)
+
+    def close(self):
+        # memoryview‌ها باید قبل از بستن mmap آزاد شوند
+        for view in (self._ids, self._offsets, self._codes, self._names):
+            view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    # --- دسترسی ---
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _index(self, national_id: str) -> int:
+        if not packable(national_id):
+            return -1
+        key = int(national_id)
+        i = bisect.bisect_left(self._ids, key)
+        return i if i < len(self._ids) and self._ids[i] == key else -1
+
+    def _row(self, i: int) -> Dict:
+        off = self._offsets
+        return {
+            'national_id': str(self._ids[i]).zfill(10),
+            'full_name': str(self._names[off[2 * i]:off[2 * i + 1]], "utf-8"),
+            'father_name': str(self._names[off[2 * i + 1]:off[2 * i + 2]], "utf-8"),
+            'payment_status': self._statuses[self._codes[i]],
+        }
+
+    def get(self, national_id: str) -> Optional[Dict]:
+        """ردیف شرکت‌کننده به همان شکل خروجی get_participant_info، یا None"""
+        i = self._index(national_id)
+        return self._row(i) if i >= 0 else None
@@ -0,0 +1,87 @@
+# search.py
+# سرویس جستجوی شرکت‌کنندگان با کش نتایج (LRU + TTL)
+# اپراتورها یک نام را بارها تایپ می‌کنند؛ نتایج در حافظه نگه داشته می‌شوند تا
+# جستجوی تکراری و جستجوی دقیق‌تر (مثلا «محمد» بعد از «محم») بدون کوئری جدید به دیتابیس پاسخ داده شود.
+# دیتابیس روی ستون search_key (نام نرمال‌شده با utils.participant_search_key و collation باینری) جستجو
+# می‌کند و فیلتر پایتون همان زیررشته را روی همان مقدار نرمال‌شده بررسی می‌کند؛ پس نتیجه فیلتر
+# دقیقاً همان چیزی است که دیتابیس برای عبارت بلندتر برمی‌گرداند.
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+
+import config
+import database as db
+import utils
+
+class SearchCache:
+    """کش LRU با انقضای زمانی؛ هر مقدار (نتایج، بریده‌شده در سقف SEARCH_MAX_RESULTS) است"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict], bool]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict], bool]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, results, truncated = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return results, truncated
+
+    def put(self, key: str, results: List[Dict], truncated: bool):
+        self._entries[key] = (time.monotonic(), results, truncated)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+_cache = SearchCache(config.SEARCH_CACHE_SIZE, config.SEARCH_CACHE_TTL_SECONDS)
+
+def normalize_query(query: str) -> str:
+    """کلید کش و متنی که به دیتابیس فرستاده می‌شود (همان نرمال‌سازی ستون search_key)"""
+    return utils.normalize_search_text(query)
+
+def search(query: str) -> Tuple[List[Dict], bool]:
+    """
+    جستجوی شرکت‌کننده با استفاده از کش؛ خروجی: (نتایج، بریده‌شده).
+    اگر نتیجه یکی از پیشوندهای عبارت در کش باشد و به سقف SEARCH_MAX_RESULTS نرسیده باشد،
+    هر ردیفی که با عبارت بلندتر جور است در آن هست و نتیجه بدون دیتابیس از آن فیلتر می‌شود.
+    """
+    key = normalize_query(query)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    # استفاده مجدد از نتایج پیشوندها: «محم» ⊇ «محمد»
+    for end in range(len(key) - 1, 1, -1):
+        prefix_hit = _cache.get(key[:end])
+        if prefix_hit is not None and not prefix_hit[1]:
+            results = [p for p in prefix_hit[0]
+                       if key in utils.participant_search_key(p['full_name'], p['father_name'])]
+            _cache.put(key, results, False)
+            return results, False
+
+    # یک ردیف بیشتر از سقف خوانده می‌شود تا معلوم شود نتایج بریده شده‌اند یا نه
+    results = db.search_participants(key, limit=config.SEARCH_MAX_RESULTS + 1)
+    truncated = len(results) > config.SEARCH_MAX_RESULTS
+    results = results[:config.SEARCH_MAX_RESULTS]
+    _cache.put(key, results, truncated)
+    return results, truncated
+
+def get_page(results: List[Dict], page: int) -> Tuple[List[Dict], int, int]:
+    """برش یک صفحه از نتایج؛ خروجی: (ردیف‌ها، شماره صفحه اصلاح‌شده، تعداد کل صفحات)"""
+    page_size = config.SEARCH_PAGE_SIZE
+    total_pages = max(1, -(-len(results) // page_size))
+    page = min(max(page, 0), total_pages - 1)
+    start = page * page_size
+    return results[start:start + page_size], page, total_pages
+
+def invalidate():
+    """پاک کردن کش؛ بعد از هر تغییر در لیست شرکت‌کنندگان (بارگذاری اکسل) صدا زده شود"""
+    _cache.clear()
@@ -6,6 +6,20 @@ def validate_national_id(nid: str) -> bool:
     """بررسی میکند که آیا کد ملی ۱۰ رقمی و عددی است یا خیر"""
     return nid.isdigit() and len(nid) == 10
 
+# حروف عربی که در نام‌ها جای معادل فارسی خود تایپ می‌شوند
+_SEARCH_CHAR_MAP = str.maketrans({"ي": "ی", "ى": "ی", "ك": "ک"})
+
+def normalize_search_text(text: Optional[str]) -> str:
+    """
+    شکل یکسان متن برای جستجو: حروف کوچک (casefold)، یکی کردن ي/ی و ك/ک و حذف فاصله‌های اضافه.
+    هم ستون search_key دیتابیس و هم عبارت جستجو با همین تابع ساخته می‌شوند.
+    """
+    return " ".join((text or "").casefold().translate(_SEARCH_CHAR_MAP).split())
+
+def participant_search_key(full_name: Optional[str], father_name: Optional[str]) -> str:
+    """مقدار ستون search_key؛ نام و نام پدر با خط جدید جدا می‌شوند که در عبارت جستجوی نرمال‌شده هرگز نمی‌آید"""
+    return normalize_search_text(full_name) + "\n" + normalize_search_text(father_name)
+
 def process_excel_file(file_bytes: bytes) -> Optional[pd.DataFrame]:
     """خواندن فایل اکسل و تبدیل آن به دیتافریم پانداز"""
     try: